@@ -1,9 +1,60 @@
+import concurrent.futures
+import functools
+import hashlib
 import os
-from typing import Optional, Tuple
+import re
+import threading
+import time
+from typing import Generator, List, Optional, Tuple
+import httpx
 import streamlit as st
 
 # Only allowed OpenAI import
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
+
+try:
+    from twilio.rest import Client as TwilioClient
+except ImportError:
+    TwilioClient = None
+
+MODEL_OPTIONS = ["gpt-4o-mini", "gpt-4o", "gpt-4-turbo", "gpt-4"]
+DEFAULT_MODEL = MODEL_OPTIONS[0]
+
+HISTORY_PAGE_SIZE = 25
+
+# Identical (recipient, body) sends within this many seconds are treated as accidental repeats
+DUPLICATE_SEND_WINDOW_S = 30
+
+_E164_RE = re.compile(r"\+[1-9][0-9]{7,14}")
+
+_REQUIRED_TWILIO = (
+    ("twilio_sid", "Account SID"),
+    ("twilio_token", "Auth Token"),
+    ("twilio_from", "WhatsApp From"),
+)
+
+# Prompt text is built once; invariant instructions lead each user message so
+# the request prefix stays identical across calls (server-side prompt caching)
+_GEN_SYSTEM = "You are a helpful assistant that crafts concise, friendly WhatsApp messages."
+_GEN_INSTRUCTIONS = (
+    "Instructions:\n"
+    "- Write a single concise WhatsApp message (max 500 characters).\n"
+    "- Write it as one paragraph with no blank lines.\n"
+    "- Be clear and natural, suitable for WhatsApp.\n"
+    "- If it involves a request, include a simple call-to-action.\n"
+    "- Return only the message text. No quotes, no markdown, no preface.\n"
+)
+
+_IMPROVE_SYSTEM = "You are a helpful assistant that refines short WhatsApp messages."
+_IMPROVE_INSTRUCTIONS = (
+    "Rewrite the following WhatsApp message to improve clarity, tone, and flow.\n"
+    "Return only the message text with no quotes or extra commentary.\n\n"
+)
+_IMPROVE_USER_TEMPLATE = (
+    "Desired tone: {tone}\n"
+    "{shorten_instr}\n\n"
+    "Message:\n{original}"
+)
 
 
 def init_page():
@@ -12,69 +63,124 @@ def init_page():
     st.caption("Compose or refine a message with AI and send it via WhatsApp")
 
 
+@functools.lru_cache(maxsize=32)
 def get_secret(name: str, default: str = "") -> str:
-    # Prefer Streamlit secrets, then environment
+    # Prefer Streamlit secrets, then environment; st.secrets is process-global,
+    # so the result is safe to memoize across reruns
     try:
         return st.secrets.get(name, os.getenv(name, default))
     except Exception:
         return os.getenv(name, default)
 
 
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key: str) -> OpenAI:
+    # One client (and HTTP/2 keep-alive connection pool) per API key, reused across reruns;
+    # DefaultHttpxClient keeps the SDK's timeout and redirect defaults
+    http_client = DefaultHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    return OpenAI(api_key=api_key, http_client=http_client)
+
+
+@st.cache_resource(show_spinner=False)
+def get_twilio_client(sid: str, token: str):
+    # One Twilio client per credential pair, reused across reruns
+    return TwilioClient(sid, token)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@st.cache_resource(show_spinner=False)
+def get_rate_limiter() -> TokenBucket:
+    # Keep outbound sends under Twilio's 25 MPS text limit, shared across sessions
+    return TokenBucket(rate=20, capacity=25)
+
+
+@st.cache_resource(show_spinner=False)
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    # Shared worker pool so Twilio round-trips don't block the script run
+    return concurrent.futures.ThreadPoolExecutor(max_workers=8)
+
+
 def sidebar_config() -> Tuple[Optional[OpenAI], dict]:
     st.sidebar.header("Configuration")
 
-    # OpenAI API Key
-    openai_key = st.sidebar.text_input(
-        "OpenAI API Key",
-        type="password",
-        value=get_secret("OPENAI_API_KEY", ""),
-        help="Set as environment variable OPENAI_API_KEY or paste here."
-    )
-    if openai_key:
-        os.environ["OPENAI_API_KEY"] = openai_key
-
-    # Initialize OpenAI client only after key is potentially set
-    client: Optional[OpenAI] = None
-    if os.getenv("OPENAI_API_KEY"):
-        client = OpenAI()
-    else:
+    # Batch all fields in a form so edits trigger a single rerun on "Apply"
+    with st.sidebar.form("cfg_form"):
+        # OpenAI API Key
+        openai_key = st.text_input(
+            "OpenAI API Key",
+            type="password",
+            value=get_secret("OPENAI_API_KEY", ""),
+            help="Set as environment variable OPENAI_API_KEY or paste here."
+        )
+        model = st.selectbox("Model", options=MODEL_OPTIONS, index=0)
+
+        st.markdown("---")
+        st.subheader("Twilio WhatsApp")
+        twilio_sid = st.text_input(
+            "Twilio Account SID",
+            value=get_secret("TWILIO_ACCOUNT_SID", ""),
+            help="Set as TWILIO_ACCOUNT_SID"
+        )
+        twilio_token = st.text_input(
+            "Twilio Auth Token",
+            type="password",
+            value=get_secret("TWILIO_AUTH_TOKEN", ""),
+            help="Set as TWILIO_AUTH_TOKEN"
+        )
+        twilio_whatsapp_from = st.text_input(
+            "Twilio WhatsApp From (e.g., whatsapp:+14155238886)",
+            value=get_secret("TWILIO_WHATSAPP_FROM", ""),
+            help="Your Twilio WhatsApp-enabled sender number, prefix with 'whatsapp:'."
+        )
+        submitted = st.form_submit_button("Apply")
+
+    # Seed from secrets/env on the first run, then only update on submit
+    if submitted or "cfg" not in st.session_state:
+        st.session_state["cfg"] = {
+            "openai_key": openai_key.strip(),
+            "model": model,
+            "twilio_sid": twilio_sid.strip(),
+            "twilio_token": twilio_token.strip(),
+            "twilio_from": twilio_whatsapp_from.strip(),
+        }
+    cfg = st.session_state.get("cfg", {})
+
+    # Pass the key explicitly so the cached client is keyed on it
+    openai_key = cfg.get("openai_key", "")
+    client: Optional[OpenAI] = get_openai_client(openai_key) if openai_key else None
+    if client is None:
         st.sidebar.warning("Provide your OpenAI API key to enable AI message crafting.")
 
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Twilio WhatsApp")
-    twilio_sid = st.sidebar.text_input(
-        "Twilio Account SID",
-        value=get_secret("TWILIO_ACCOUNT_SID", ""),
-        help="Set as TWILIO_ACCOUNT_SID"
-    )
-    twilio_token = st.sidebar.text_input(
-        "Twilio Auth Token",
-        type="password",
-        value=get_secret("TWILIO_AUTH_TOKEN", ""),
-        help="Set as TWILIO_AUTH_TOKEN"
-    )
-    twilio_whatsapp_from = st.sidebar.text_input(
-        "Twilio WhatsApp From (e.g., whatsapp:+14155238886)",
-        value=get_secret("TWILIO_WHATSAPP_FROM", ""),
-        help="Your Twilio WhatsApp-enabled sender number, prefix with 'whatsapp:'."
-    )
-
-    cfg = {
-        "twilio_sid": twilio_sid.strip(),
-        "twilio_token": twilio_token.strip(),
-        "twilio_from": twilio_whatsapp_from.strip(),
-    }
     return client, cfg
 
 
 def require_twilio(cfg: dict) -> bool:
-    missing = []
-    if not cfg.get("twilio_sid"):
-        missing.append("Account SID")
-    if not cfg.get("twilio_token"):
-        missing.append("Auth Token")
-    if not cfg.get("twilio_from"):
-        missing.append("WhatsApp From")
+    missing = [label for key, label in _REQUIRED_TWILIO if not cfg.get(key)]
     if missing:
         st.error(f"Missing Twilio config: {', '.join(missing)}")
         return False
@@ -88,77 +194,216 @@ def sanitize_whatsapp_to(number: str) -> Optional[str]:
     num = number.strip()
     if not num:
         return None
-    if not num.startswith("+"):
-        st.error("Recipient number must be in E.164 format starting with '+', e.g., +15551234567")
+    if not _E164_RE.fullmatch(num):
+        st.error("Recipient number must be in E.164 format: '+' followed by 8-15 digits, e.g., +15551234567")
         return None
     return f"whatsapp:{num}"
 
 
-def generate_message_with_ai(client: OpenAI, brief: str, tone: str, extras: str, emoji: bool) -> str:
+def stream_completion_text(response) -> Generator[str, None, Optional[str]]:
+    # Yield incremental text deltas from a streamed chat completion; returns the finish_reason
+    finish_reason = None
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        finish_reason = choice.finish_reason or finish_reason
+        yield choice.delta.content or ""
+    return finish_reason
+
+
+def render_stream(chunks: Generator[str, None, Optional[str]]) -> str:
+    # Update a single placeholder per token, then clear it for the editable text area
+    placeholder = st.empty()
+    parts = []
+    while True:
+        try:
+            delta = next(chunks)
+        except StopIteration as done:
+            finish_reason = done.value
+            break
+        parts.append(delta)
+        placeholder.markdown("".join(parts))
+    placeholder.empty()
+    if finish_reason == "length":
+        st.warning("The AI response hit the length limit and may be cut off. Review the draft before sending.")
+    return "".join(parts).strip()
+
+
+def generate_message_with_ai(client: OpenAI, brief: str, tone: str, extras: str, emoji: bool, model: str = DEFAULT_MODEL) -> Generator[str, None, Optional[str]]:
     tone_text = tone if tone.lower() != "custom" else "custom tone"
     emoji_pref = "Include a subtle, relevant emoji." if emoji else "Do not include any emoji."
-    user_prompt = (
-        f"Goal/Context:\n{brief.strip()}\n\n"
-        f"Tone: {tone_text}\n"
-        f"Additional details/constraints:\n{extras.strip()}\n\n"
-        f"Instructions:\n"
-        f"- Write a single concise WhatsApp message (max 500 characters).\n"
-        f"- Be clear and natural, suitable for WhatsApp.\n"
-        f"- If it involves a request, include a simple call-to-action.\n"
-        f"- {emoji_pref}\n"
-        f"- Return only the message text. No quotes, no markdown, no preface."
-    )
+    user_prompt = "\n".join([
+        _GEN_INSTRUCTIONS,
+        f"Goal/Context:\n{brief.strip()}\n",
+        f"Tone: {tone_text}",
+        f"Additional details/constraints:\n{extras.strip()}\n",
+        f"Emoji: {emoji_pref}",
+    ])
     response = client.chat.completions.create(
-        model="gpt-4",
+        model=model,
         messages=[
-            {"role": "system", "content": "You are a helpful assistant that crafts concise, friendly WhatsApp messages."},
+            {"role": "system", "content": _GEN_SYSTEM},
             {"role": "user", "content": user_prompt},
         ],
         temperature=0.7,
-        max_tokens=300,
+        top_p=0.9,
+        max_tokens=160,
+        stop=["\n\n"],
+        stream=True,
     )
-    return (response.choices[0].message.content or "").strip()
+    return stream_completion_text(response)
 
 
-def improve_message_with_ai(client: OpenAI, original: str, tone: str, shorten: bool) -> str:
+def improve_message_with_ai(client: OpenAI, original: str, tone: str, shorten: bool, model: str = DEFAULT_MODEL) -> Generator[str, None, Optional[str]]:
     shorten_instr = "Shorten to be more concise but keep the key message." if shorten else "Keep roughly the same length."
-    user_prompt = (
-        f"Rewrite the following WhatsApp message to improve clarity, tone, and flow.\n"
-        f"Desired tone: {tone}\n"
-        f"{shorten_instr}\n"
-        f"Return only the message text with no quotes or extra commentary.\n\n"
-        f"Message:\n{original.strip()}"
+    user_prompt = _IMPROVE_INSTRUCTIONS + _IMPROVE_USER_TEMPLATE.format(
+        tone=tone, shorten_instr=shorten_instr, original=original.strip()
     )
     response = client.chat.completions.create(
-        model="gpt-4",
+        model=model,
         messages=[
-            {"role": "system", "content": "You are a helpful assistant that refines short WhatsApp messages."},
+            {"role": "system", "content": _IMPROVE_SYSTEM},
             {"role": "user", "content": user_prompt},
         ],
-        temperature=0.5,
-        max_tokens=300,
+        temperature=0.3,
+        # User text has no length limit: leave ~2x headroom over its token count (~4 chars/token)
+        max_tokens=min(2048, max(160, len(original) // 2)),
+        stream=True,
     )
-    return (response.choices[0].message.content or "").strip()
+    return stream_completion_text(response)
 
 
 def send_whatsapp_message(cfg: dict, to_number: str, body: str) -> Optional[str]:
+    # Runs on a worker thread: no st.* calls here, errors propagate via the future.
+    # Callers take a rate-limit token before submitting so workers never sleep on the bucket.
+    if TwilioClient is None:
+        raise RuntimeError("Twilio library not installed. Run: pip install twilio")
+
+    client = get_twilio_client(cfg["twilio_sid"], cfg["twilio_token"])
+    msg = client.messages.create(
+        from_=cfg["twilio_from"],
+        to=to_number,
+        body=body
+    )
+    return msg.sid
+
+
+def _send_or_error(cfg: dict, to_number: str, body: str) -> Tuple[Optional[str], Optional[str]]:
+    # Worker-side wrapper so one failed recipient doesn't abort the broadcast
     try:
-        from twilio.rest import Client as TwilioClient
-    except ImportError:
-        st.error("Twilio library not installed. Run: pip install twilio")
-        return None
+        return send_whatsapp_message(cfg, to_number, body), None
+    except Exception as e:
+        return None, str(e)
+
+
+def send_whatsapp_bulk(cfg: dict, to_numbers: List[str], body: str) -> List[Tuple[Optional[str], Optional[str]]]:
+    # Fan out over the shared executor; returns (sid, error) per recipient.
+    # Tokens are taken here, before each submit, so a large broadcast paces itself
+    # on the script thread instead of parking shared workers in the limiter.
+    exe = get_executor()
+    limiter = get_rate_limiter()
+    futs = []
+    for to_number in to_numbers:
+        limiter.acquire()
+        futs.append(exe.submit(_send_or_error, cfg, to_number, body))
+    return [f.result() for f in futs]
 
+
+def validate_twilio(cfg: dict) -> str:
+    # Runs on a worker thread: checks credentials and warms the Twilio connection
+    client = get_twilio_client(cfg["twilio_sid"], cfg["twilio_token"])
+    return client.api.accounts(cfg["twilio_sid"]).fetch().status
+
+
+def prewarm_twilio(cfg: dict):
+    # Validate the Twilio account concurrently with AI generation, once per credential pair
+    if TwilioClient is None or not (cfg.get("twilio_sid") and cfg.get("twilio_token")):
+        return
+    key = (cfg["twilio_sid"], cfg["twilio_token"])
+    check = st.session_state.get("twilio_check")
+    if check and check["key"] == key:
+        return
+    st.session_state["twilio_check"] = {"key": key, "future": get_executor().submit(validate_twilio, cfg)}
+
+
+def twilio_check_failed(cfg: dict) -> bool:
+    # Surface a finished, failed credential check instead of attempting the send
+    check = st.session_state.get("twilio_check")
+    if not check or check["key"] != (cfg.get("twilio_sid"), cfg.get("twilio_token")):
+        return False
+    future = check["future"]
+    if not future.done():
+        return False
+    error = future.exception()
+    if error is None:
+        status = future.result()
+        if status == "active":
+            return False
+        error = f"account status is '{status}'"
+    # Drop the result so the next attempt re-validates
+    del st.session_state["twilio_check"]
+    st.error(f"Twilio credentials check failed: {error}")
+    return True
+
+
+def send_key(to_number: str, body: str) -> str:
+    # Cheap fingerprint of (recipient, body) used to drop accidental duplicate sends
+    return hashlib.blake2b(f"{to_number}|{body}".encode(), digest_size=16).hexdigest()
+
+
+def is_duplicate_send(key: str) -> bool:
+    # True if the same fingerprint was sent within the duplicate window; prunes expired entries
+    recent = st.session_state.setdefault("recent_sends", {})
+    cutoff = time.monotonic() - DUPLICATE_SEND_WINDOW_S
+    for old_key in [k for k, sent_at in recent.items() if sent_at < cutoff]:
+        del recent[old_key]
+    return key in recent
+
+
+def remember_send(key: str):
+    st.session_state.setdefault("recent_sends", {})[key] = time.monotonic()
+
+
+def forget_send(key: Optional[str]):
+    st.session_state.get("recent_sends", {}).pop(key, None)
+
+
+@st.fragment(run_every=1.0)
+def send_status_ui():
+    # Poll the background send; only rendered while a send is pending, so polling stops with it
+    future = st.session_state.get("send_future")
+    if future is None:
+        return
+    if not future.done():
+        st.info("Sending via WhatsApp in the background...")
+        return
+
+    pending = st.session_state.pop("send_pending", {})
+    del st.session_state["send_future"]
     try:
-        client = TwilioClient(cfg["twilio_sid"], cfg["twilio_token"])
-        msg = client.messages.create(
-            from_=cfg["twilio_from"],
-            to=to_number,
-            body=body
-        )
-        return msg.sid
+        sid = future.result()
     except Exception as e:
-        st.error(f"Failed to send WhatsApp message: {e}")
-        return None
+        # Allow retrying a send that never went out
+        forget_send(pending.get("key"))
+        st.session_state["send_notice"] = ("error", f"Failed to send WhatsApp message: {e}")
+        st.rerun()
+    pending.pop("key", None)
+    if sid:
+        st.session_state.history.append({**pending, "sid": sid})
+        # Clear draft
+        st.session_state["draft_message"] = ""
+        st.session_state["send_notice"] = ("success", f"Message sent! SID: {sid}")
+    # Full rerun so Compose re-enables Send and the History fragment picks up the new entry
+    st.rerun()
+
+
+def show_send_notice():
+    # Display the outcome of the last background send once
+    notice = st.session_state.pop("send_notice", None)
+    if notice:
+        level, text = notice
+        getattr(st, level)(text)
 
 
 def init_session_state():
@@ -166,18 +411,29 @@ def init_session_state():
         st.session_state.history = []  # list of dicts: {to, body, sid}
 
 
+@st.fragment
 def history_ui():
     st.subheader("Sent Messages")
-    if not st.session_state.history:
+    history = st.session_state.history
+    if not history:
         st.info("No messages sent yet.")
         return
-    for idx, item in enumerate(reversed(st.session_state.history), start=1):
+    # Render only the most recent page unless the user asks for everything
+    show_all = st.session_state.get("show_all", False)
+    k = len(history) if show_all else HISTORY_PAGE_SIZE
+    # Negative-step slice yields just the k newest items, already in display order
+    for idx, item in enumerate(history[-1:-k - 1:-1], start=1):
         with st.expander(f"{idx}. To: {item.get('to_display', '')} | SID: {item.get('sid', 'N/A')}"):
             st.code(item.get("body", ""), language=None)
+    if len(history) > HISTORY_PAGE_SIZE and not show_all:
+        st.button("Show older", on_click=lambda: st.session_state.update(show_all=True))
 
 
+@st.fragment
 def compose_ui(client: Optional[OpenAI], cfg: dict):
     st.subheader("Compose")
+    show_send_notice()
+    send_pending = st.session_state.get("send_future") is not None
 
     col1, col2 = st.columns([1, 1])
     with col1:
@@ -202,12 +458,12 @@ def compose_ui(client: Optional[OpenAI], cfg: dict):
         emoji = st.checkbox("Add a subtle emoji", value=False)
 
         if st.button("Generate with AI", disabled=(client is None or not brief.strip())):
-            with st.spinner("Thinking..."):
-                try:
-                    message_text = generate_message_with_ai(client, brief, tone, extras, emoji)
-                    st.session_state["draft_message"] = message_text
-                except Exception as e:
-                    st.error(f"AI generation failed: {e}")
+            prewarm_twilio(cfg)
+            try:
+                message_text = render_stream(generate_message_with_ai(client, brief, tone, extras, emoji, cfg.get("model", DEFAULT_MODEL)))
+                st.session_state["draft_message"] = message_text
+            except Exception as e:
+                st.error(f"AI generation failed: {e}")
 
         message_text = st.text_area("Message (editable)", value=st.session_state.get("draft_message", ""), height=160)
 
@@ -222,12 +478,11 @@ def compose_ui(client: Optional[OpenAI], cfg: dict):
             tone = st.selectbox("Improvement tone", options=["Friendly", "Professional", "Formal", "Casual", "Apologetic", "Urgent", "Promotional"], index=0)
 
         if st.button("Improve Message", disabled=(client is None or not message_text.strip())):
-            with st.spinner("Improving..."):
-                try:
-                    improved = improve_message_with_ai(client, message_text, tone, shorten)
-                    st.session_state["draft_message"] = improved
-                except Exception as e:
-                    st.error(f"AI improvement failed: {e}")
+            try:
+                improved = render_stream(improve_message_with_ai(client, message_text, tone, shorten, cfg.get("model", DEFAULT_MODEL)))
+                st.session_state["draft_message"] = improved
+            except Exception as e:
+                st.error(f"AI improvement failed: {e}")
 
         if "draft_message" in st.session_state and st.session_state["draft_message"]:
             message_text = st.text_area("Message (editable)", value=st.session_state["draft_message"], height=160)
@@ -238,7 +493,7 @@ def compose_ui(client: Optional[OpenAI], cfg: dict):
     with col_s1:
         preview = st.button("Preview")
     with col_s2:
-        disabled_send = not (send_now and message_text.strip() and to_input.strip())
+        disabled_send = send_pending or not (send_now and message_text.strip() and to_input.strip())
         send = st.button("Send on WhatsApp", type="primary", disabled=disabled_send)
 
     if preview:
@@ -251,18 +506,92 @@ def compose_ui(client: Optional[OpenAI], cfg: dict):
         to_whatsapp = sanitize_whatsapp_to(to_input)
         if not to_whatsapp:
             return
-        with st.spinner("Sending via WhatsApp..."):
-            sid = send_whatsapp_message(cfg, to_whatsapp, message_text.strip())
-        if sid:
-            st.success(f"Message sent! SID: {sid}")
-            st.session_state.history.append({
-                "to_display": to_input.strip(),
-                "to": to_whatsapp,
-                "body": message_text.strip(),
-                "sid": sid
-            })
-            # Clear draft
-            st.session_state["draft_message"] = ""
+        if TwilioClient is None:
+            st.error("Twilio library not installed. Run: pip install twilio")
+            return
+        if twilio_check_failed(cfg):
+            return
+        key = send_key(to_whatsapp, message_text.strip())
+        if is_duplicate_send(key):
+            st.warning(
+                f"This message was just sent to this recipient. Wait {DUPLICATE_SEND_WINDOW_S}s to send it again."
+            )
+            return
+        remember_send(key)
+        get_rate_limiter().acquire()
+        st.session_state["send_future"] = get_executor().submit(
+            send_whatsapp_message, cfg, to_whatsapp, message_text.strip()
+        )
+        st.session_state["send_pending"] = {
+            "key": key,
+            "to_display": to_input.strip(),
+            "to": to_whatsapp,
+            "body": message_text.strip(),
+        }
+        # Full rerun so main() renders the polling status fragment
+        st.rerun()
+
+
+def broadcast_ui(cfg: dict):
+    st.subheader("Broadcast")
+    numbers_input = st.text_area(
+        "Recipient WhatsApp numbers (E.164, one per line or comma-separated)",
+        height=120,
+        placeholder="+15551234567\n+15557654321",
+    )
+    # Stable key so compose draft changes don't reset what the user typed
+    body = st.text_area("Broadcast message", key="broadcast_body", height=160).strip()
+    st.button(
+        "Use compose draft",
+        disabled=not st.session_state.get("draft_message"),
+        on_click=lambda: st.session_state.update(broadcast_body=st.session_state.get("draft_message", "")),
+    )
+    send_now = st.toggle("Ready to broadcast", value=False)
+
+    raw_numbers = [n for n in re.split(r"[,\s]+", numbers_input) if n]
+    if not st.button("Send broadcast", type="primary", disabled=not (send_now and body and raw_numbers)):
+        return
+    if not require_twilio(cfg):
+        return
+    if TwilioClient is None:
+        st.error("Twilio library not installed. Run: pip install twilio")
+        return
+    if twilio_check_failed(cfg):
+        return
+
+    # Validate and de-duplicate recipients, skipping anything sent within the duplicate window
+    targets = {}
+    for raw in raw_numbers:
+        to_whatsapp = sanitize_whatsapp_to(raw)
+        if not to_whatsapp or to_whatsapp in targets:
+            continue
+        if is_duplicate_send(send_key(to_whatsapp, body)):
+            st.warning(f"Just sent to {raw}. Skipping duplicate send.")
+            continue
+        targets[to_whatsapp] = raw
+    if not targets:
+        return
+
+    with st.spinner(f"Sending to {len(targets)} recipient(s)..."):
+        results = send_whatsapp_bulk(cfg, list(targets), body)
+
+    failed = []
+    for (to_whatsapp, raw), (sid, error) in zip(targets.items(), results):
+        if not sid:
+            failed.append(f"{raw} ({error or 'no SID returned'})")
+            continue
+        remember_send(send_key(to_whatsapp, body))
+        st.session_state.history.append({
+            "to_display": raw,
+            "to": to_whatsapp,
+            "body": body,
+            "sid": sid
+        })
+    sent = len(targets) - len(failed)
+    if sent:
+        st.success(f"Broadcast sent to {sent} recipient(s).")
+    if failed:
+        st.error("Failed to send to:\n" + "\n".join(f"- {item}" for item in failed))
 
 
 def main():
@@ -270,10 +599,14 @@ def main():
     init_session_state()
     client, cfg = sidebar_config()
 
-    tabs = st.tabs(["Compose", "History"])
+    tabs = st.tabs(["Compose", "Broadcast", "History"])
     with tabs[0]:
+        if st.session_state.get("send_future") is not None:
+            send_status_ui()
         compose_ui(client, cfg)
     with tabs[1]:
+        broadcast_ui(cfg)
+    with tabs[2]:
         history_ui()
 
     st.markdown("---")